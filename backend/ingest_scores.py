@@ -7,6 +7,7 @@ from collections import defaultdict
 from difflib import get_close_matches
 from supabase import create_client, Client
 from postgrest.exceptions import APIError
+from local_mirror import LocalMirror
 
 # ─── CONFIG ───────────────────────────────────────────────────────────────────
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -29,9 +30,16 @@ def slugify(name: str) -> str:
     return s
 
 # ─── FETCH VALID SLUGS ─────────────────────────────────────────────────────────
-resp = auth_supabase.table('schools').select('name').execute()
-valid_entries = resp.data or []
-valid_slugs = set(slugify(entry.get('name','')) for entry in valid_entries)
+# Read school names from the local mirror; only hits Supabase when it's stale,
+# or always when LOCAL_MIRROR_REFRESH=1
+with LocalMirror() as mirror:
+    if os.getenv("LOCAL_MIRROR_REFRESH") == "1":
+        mirror.refresh(auth_supabase, 'schools')
+    else:
+        mirror.ensure_fresh(auth_supabase, ['schools'])
+    valid_slugs = set(slugify(name or '') for name in mirror.column('schools', 'name'))
+if not valid_slugs:
+    raise RuntimeError("❌ No schools in local mirror – run backend/local_mirror.py schools")
 
 # Helper to normalize raw slug to a valid school slug
 def normalize_slug(raw: str) -> str:
@@ -114,6 +122,8 @@ def ingest_sports():
     print(f"[DEBUG] Inserting {len(records)} football records")
     supabase.table('school_sports_scores').insert(records).execute()
     print(f"✔️ Inserted {len(records)} football records")
+    with LocalMirror() as mirror:
+        mirror.refresh(supabase, 'school_sports_scores')
 
 # ─── INGEST CCA SCORES ───────────────────────────────────────────────────────────
 def ingest_cca():
@@ -146,6 +156,8 @@ def ingest_cca():
     print(f"[DEBUG] Inserting {len(records)} CCA records")
     supabase.table('school_cca_scores').insert(records).execute()
     print(f"✔️ Inserted {len(records)} CCA records")
+    with LocalMirror() as mirror:
+        mirror.refresh(supabase, 'school_cca_scores')
 
 # ─── MAIN ───────────────────────────────────────────────────────────────────────
 if __name__ == '__main__':
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Keep a local SQLite mirror of the Supabase reference tables so ETL scripts can
+look up schools, primaries, affiliations and scores without a remote round-trip
+at startup, and diff fresh data against what's already stored.
+
+A refresh still reads the whole remote table (page by page, in primary-key
+order); it is incremental only on the local side: each row is hashed, rows
+whose hash is unchanged are left alone, and rows that disappeared remotely are
+removed. Scripts that write a mirrored table should call `refresh()` for it
+afterwards so readers don't see stale data.
+
+Usage:
+    python backend/local_mirror.py                 # refresh every table
+    python backend/local_mirror.py schools         # refresh selected tables
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+
+# ─── CONFIG ───────────────────────────────────────────────────────────────────
+# Default to project-root/data regardless of the working directory
+script_dir  = os.path.dirname(os.path.abspath(__file__))
+MIRROR_PATH = os.getenv(
+    "LOCAL_MIRROR_PATH",
+    os.path.normpath(os.path.join(script_dir, os.pardir, "data", "supabase_mirror.sqlite3")),
+)
+PAGE_SIZE   = 1000
+MAX_AGE     = 60 * 60  # seconds before ensure_fresh() re-syncs a table
+
+# table -> key columns (remote sort order + local primary key),
+#          extra indexed columns
+TABLES = {
+    "schools": {
+        "key": ["name"],
+        "index": ["code"],
+    },
+    "primaries": {
+        "key": ["slug"],
+        "index": ["name", "code"],
+    },
+    "secondary_affiliations": {
+        "key": ["primary_name", "secondary_code"],
+        "index": ["primary_slug", "secondary_code"],
+    },
+    "school_sports_scores": {
+        "key": ["code", "sport", "year"],
+        "index": ["school_slug", "sport", "year"],
+    },
+    "school_cca_scores": {
+        "key": ["code", "cca", "year"],
+        "index": ["school_slug", "cca", "year"],
+    },
+}
+
+# ─── HELPERS ────────────────────────────────────────────────────────────────────
+def row_hash(row: dict) -> str:
+    """Stable hash of a row, independent of key order."""
+    blob = json.dumps(row, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _same(new, stored) -> bool:
+    """
+    True if an incoming value matches what's stored. Strings are only read as
+    numbers when the stored value is numeric, so "1" vs a stored "1.0" differs.
+    """
+    if _is_number(stored):
+        if isinstance(new, str) and re.fullmatch(r"\s*-?\d+(\.\d+)?\s*", new):
+            new = float(new)
+        return _is_number(new) and float(new) == float(stored)
+    if isinstance(stored, dict):
+        return (
+            isinstance(new, dict)
+            and new.keys() == stored.keys()
+            and all(_same(new[k], stored[k]) for k in stored)
+        )
+    if isinstance(stored, list):
+        return (
+            isinstance(new, list)
+            and len(new) == len(stored)
+            and all(_same(a, b) for a, b in zip(new, stored))
+        )
+    return new == stored
+
+def _quote(ident: str) -> str:
+    return '"' + ident.replace('"', '""') + '"'
+
+# ─── MIRROR ─────────────────────────────────────────────────────────────────────
+class LocalMirror:
+    """SQLite copy of the reference tables, keyed and indexed per TABLES."""
+
+    def __init__(self, path: str = MIRROR_PATH, tables: dict = TABLES):
+        self.path = path
+        self.tables = tables
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self._init_schema()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _columns(self, table: str) -> list:
+        spec = self.tables[table]
+        return list(dict.fromkeys(spec["key"] + spec["index"]))
+
+    def _init_schema(self):
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS _mirror_meta ("
+                " tbl TEXT PRIMARY KEY, synced_at REAL)"
+            )
+            for table, spec in self.tables.items():
+                # The mirror is only a cache: rebuild tables whose layout changed
+                info = self.conn.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+                pk = [r["name"] for r in sorted(info, key=lambda r: r["pk"]) if r["pk"]]
+                names = [r["name"] for r in info if not r["name"].startswith("_")]
+                if info and (pk != spec["key"] or names != self._columns(table)):
+                    self.conn.execute(f"DROP TABLE {_quote(table)}")
+                    self.conn.execute("DELETE FROM _mirror_meta WHERE tbl = ?", (table,))
+                cols = ", ".join(_quote(c) for c in self._columns(table))
+                key = ", ".join(_quote(c) for c in spec["key"])
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {_quote(table)} ("
+                    f" {cols}, _row TEXT NOT NULL, _hash TEXT NOT NULL,"
+                    f" PRIMARY KEY ({key}))"
+                )
+                for col in spec["index"]:
+                    self.conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {_quote(f'idx_{table}_{col}')}"
+                        f" ON {_quote(table)} ({_quote(col)})"
+                    )
+
+    def _local_hashes(self, table: str) -> dict:
+        key = self.tables[table]["key"]
+        select = ", ".join(_quote(c) for c in key)
+        return {
+            tuple(r)[:-1]: r["_hash"]
+            for r in self.conn.execute(f"SELECT {select}, _hash FROM {_quote(table)}")
+        }
+
+    # ── writes ──
+    def _upsert(self, table: str, rows: list):
+        cols = self._columns(table)
+        names = ", ".join(_quote(c) for c in cols + ["_row", "_hash"])
+        marks = ", ".join("?" for _ in range(len(cols) + 2))
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO {_quote(table)} ({names}) VALUES ({marks})",
+            [
+                [row.get(c) for c in cols]
+                + [json.dumps(row, default=str), row_hash(row)]
+                for row in rows
+            ],
+        )
+
+    def _delete(self, table: str, keys: list):
+        where = " AND ".join(f"{_quote(c)} = ?" for c in self.tables[table]["key"])
+        self.conn.executemany(f"DELETE FROM {_quote(table)} WHERE {where}", keys)
+
+    # ── refresh ──
+    def refresh(self, client, table: str, page_size: int = PAGE_SIZE) -> dict:
+        """
+        Re-read `table` from Supabase and bring the mirror in line with it.
+        Returns counts of pages read and rows read/written/deleted.
+        Pages are read until one comes back empty, since the server may cap
+        responses below `page_size`. If the remote read comes back empty while
+        the mirror has rows, nothing is deleted and the table is not marked
+        as synced.
+        """
+        key = self.tables[table]["key"]
+        local = self._local_hashes(table)
+        stats = {"pages": 0, "read": 0, "written": 0, "deleted": 0}
+        seen = set()
+        start = 0
+        with self.conn:
+            while True:
+                query = client.table(table).select("*")
+                for col in key:
+                    query = query.order(col)
+                rows = query.range(start, start + page_size - 1).execute().data or []
+                if not rows:
+                    break
+                stats["pages"] += 1
+                stats["read"] += len(rows)
+                changed = []
+                for row in rows:
+                    k = tuple(row.get(c) for c in key)
+                    seen.add(k)
+                    if local.get(k) != row_hash(row):
+                        changed.append(row)
+                self._upsert(table, changed)
+                stats["written"] += len(changed)
+                start += len(rows)
+
+            if not seen and local:
+                print(
+                    f"⚠️  Remote `{table}` returned no rows but the mirror has"
+                    f" {len(local)}; keeping local copy (check key/RLS permissions)."
+                )
+                return stats
+
+            stale = [k for k in local if k not in seen]
+            self._delete(table, stale)
+            stats["deleted"] = len(stale)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO _mirror_meta (tbl, synced_at) VALUES (?, ?)",
+                (table, time.time()),
+            )
+        return stats
+
+    def synced_at(self, table: str):
+        row = self.conn.execute(
+            "SELECT synced_at FROM _mirror_meta WHERE tbl = ?", (table,)
+        ).fetchone()
+        return row["synced_at"] if row else None
+
+    def ensure_fresh(self, client, tables=None, max_age: float = MAX_AGE):
+        """Refresh only the tables never synced or older than `max_age` seconds."""
+        for table in tables or self.tables:
+            last = self.synced_at(table)
+            if last is None or time.time() - last > max_age:
+                self.refresh(client, table)
+
+    # ── reads ──
+    def rows(self, table: str, **filters) -> list:
+        """All mirrored rows of `table`, optionally filtered on key/index columns."""
+        sql = f"SELECT _row FROM {_quote(table)}"
+        if filters:
+            allowed = self._columns(table)
+            for col in filters:
+                if col not in allowed:
+                    raise ValueError(f"{col!r} is not a key/index column of {table}")
+            sql += " WHERE " + " AND ".join(f"{_quote(c)} = ?" for c in filters)
+        return [json.loads(r["_row"]) for r in self.conn.execute(sql, list(filters.values()))]
+
+    def get(self, table: str, **filters):
+        """First row matching `filters`, or None."""
+        found = self.rows(table, **filters)
+        return found[0] if found else None
+
+    def column(self, table: str, col: str) -> list:
+        """Values of a single key/index column across the table."""
+        if col not in self._columns(table):
+            raise ValueError(f"{col!r} is not a key/index column of {table}")
+        return [r[0] for r in self.conn.execute(
+            f"SELECT {_quote(col)} FROM {_quote(table)}"
+        )]
+
+    def diff(self, table: str, records: list):
+        """
+        Compare `records` against the mirror, looking only at the columns each
+        record carries. Numeric strings match stored numbers by value.
+        Returns (changed, removed_keys): records that are new or differ,
+        and keys present locally but absent from `records`.
+        """
+        key = self.tables[table]["key"]
+        local = [self._row_key(table, row) for row in self.rows(table)]
+        by_key = {k: row for k, row in local}
+        changed, incoming = [], set()
+        for rec in records:
+            k, current = self._match(table, rec, by_key)
+            incoming.add(k)
+            if current is None or not all(
+                _same(v, current.get(c)) for c, v in rec.items()
+            ):
+                changed.append(rec)
+        removed = [k for k, _ in local if k not in incoming]
+        return changed, removed
+
+    def _row_key(self, table: str, row: dict):
+        return tuple(row.get(c) for c in self.tables[table]["key"]), row
+
+    def _match(self, table: str, rec: dict, by_key: dict):
+        """Find the stored row for `rec`, reading numeric-string keys as numbers."""
+        k = tuple(rec.get(c) for c in self.tables[table]["key"])
+        if k in by_key:
+            return k, by_key[k]
+        for stored_key, row in by_key.items():
+            if all(_same(a, b) for a, b in zip(k, stored_key)):
+                return stored_key, row
+        return k, None
+
+# ─── MAIN ───────────────────────────────────────────────────────────────────────
+def main(argv):
+    unknown = [t for t in argv if t not in TABLES]
+    if unknown:
+        raise SystemExit(
+            f"❌ Unknown table(s): {', '.join(unknown)}."
+            f" Valid tables: {', '.join(TABLES)}"
+        )
+
+    from supabase import create_client, Client
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_SERVICE_KEY")
+    if not url or not key:
+        raise RuntimeError("❌ SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
+    client: Client = create_client(url, key)
+
+    tables = argv or list(TABLES)
+    with LocalMirror() as mirror:
+        for table in tables:
+            stats = mirror.refresh(client, table)
+            print(
+                f"✔  {table}: {stats['read']} rows read in {stats['pages']} pages,"
+                f" {stats['written']} written, {stats['deleted']} deleted"
+            )
+    print(f"Mirror at {MIRROR_PATH}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
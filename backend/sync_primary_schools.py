@@ -10,6 +10,7 @@ import os
 import requests
 from slugify import slugify
 from supabase import create_client, Client
+from local_mirror import LocalMirror
 
 # ——— CONFIGURATION ————————————————————————————————————————————————
 RESOURCE_ID  = "d_688b934f82c1059ed0a6993d2a829089"
@@ -74,5 +75,9 @@ def sync_primaries():
     except Exception as e:
         print("❌ Insert error:", e)
 
+    # 5) Keep the local mirror in line with what was just written
+    with LocalMirror() as mirror:
+        mirror.refresh(sb, TABLE_NAME)
+
 if __name__ == "__main__":
     sync_primaries()
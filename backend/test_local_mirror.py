@@ -0,0 +1,176 @@
+import sqlite3
+
+import pytest
+
+from local_mirror import LocalMirror, main
+
+# ─── STAND-IN SUPABASE CLIENT ───────────────────────────────────────────────────
+class FakeQuery:
+    def __init__(self, rows, max_rows=None):
+        self._rows = rows
+        self._max_rows = max_rows
+        self._order = []
+        self._range = (0, len(rows))
+
+    def select(self, *cols):
+        return self
+
+    def order(self, col):
+        self._order.append(col)
+        return self
+
+    def range(self, start, end):
+        self._range = (start, end)
+        return self
+
+    def execute(self):
+        rows = sorted(self._rows, key=lambda r: tuple(r[c] for c in self._order))
+        start, end = self._range
+        if self._max_rows is not None:
+            end = min(end, start + self._max_rows - 1)
+        return type("Response", (), {"data": [dict(r) for r in rows[start : end + 1]]})
+
+class FakeClient:
+    """Serves in-memory tables; `max_rows` mimics PostgREST's response cap."""
+
+    def __init__(self, max_rows=None, **tables):
+        self.max_rows = max_rows
+        self.tables = tables
+
+    def table(self, name):
+        return FakeQuery(self.tables.get(name, []), self.max_rows)
+
+def make_schools(n):
+    return [
+        {"name": f"School {i:03}", "code": 3000 + i, "cop_ranges": {"IP": [i, i + 4]}}
+        for i in range(n)
+    ]
+
+@pytest.fixture
+def mirror():
+    with LocalMirror(":memory:") as m:
+        yield m
+
+# ─── REFRESH ────────────────────────────────────────────────────────────────────
+def test_initial_sync(mirror):
+    client = FakeClient(schools=make_schools(25))
+    stats = mirror.refresh(client, "schools", page_size=10)
+    assert stats == {"pages": 3, "read": 25, "written": 25, "deleted": 0}
+    assert mirror.synced_at("schools") is not None
+
+def test_resync_without_changes_writes_nothing(mirror):
+    client = FakeClient(schools=make_schools(25))
+    mirror.refresh(client, "schools", page_size=10)
+    stats = mirror.refresh(client, "schools", page_size=10)
+    assert stats["written"] == 0 and stats["deleted"] == 0
+
+def test_updated_row_is_rewritten(mirror):
+    schools = make_schools(25)
+    client = FakeClient(schools=schools)
+    mirror.refresh(client, "schools", page_size=10)
+    schools[7]["code"] = 9999
+    stats = mirror.refresh(client, "schools", page_size=10)
+    assert stats["written"] == 1
+    assert mirror.get("schools", code=9999)["name"] == "School 007"
+
+def test_remote_delete_only_touches_that_row(mirror):
+    schools = make_schools(25)
+    client = FakeClient(schools=schools)
+    mirror.refresh(client, "schools", page_size=10)
+    del schools[0]
+    stats = mirror.refresh(client, "schools", page_size=10)
+    assert stats == {"pages": 3, "read": 24, "written": 0, "deleted": 1}
+    assert mirror.get("schools", name="School 000") is None
+
+def test_exact_page_size_multiple(mirror):
+    client = FakeClient(schools=make_schools(20))
+    stats = mirror.refresh(client, "schools", page_size=10)
+    assert stats["read"] == 20 and stats["pages"] == 2
+    assert len(mirror.column("schools", "name")) == 20
+
+def test_server_cap_below_page_size(mirror):
+    client = FakeClient(schools=make_schools(1200))
+    mirror.refresh(client, "schools", page_size=1000)
+    capped = FakeClient(max_rows=500, schools=make_schools(1200))
+    stats = mirror.refresh(capped, "schools", page_size=1000)
+    assert stats == {"pages": 3, "read": 1200, "written": 0, "deleted": 0}
+    assert len(mirror.column("schools", "name")) == 1200
+
+def test_score_tables_keyed_on_code(mirror):
+    scores = [
+        {"school_slug": "st-x", "code": "3001", "sport": "football", "year": 2024,
+         "score": 1.0, "score_breakdown": None},
+        {"school_slug": "st-x", "code": "3002", "sport": "football", "year": 2024,
+         "score": 2.0, "score_breakdown": None},
+    ]
+    client = FakeClient(school_sports_scores=scores)
+    mirror.refresh(client, "school_sports_scores")
+    stats = mirror.refresh(client, "school_sports_scores")
+    assert stats["written"] == 0
+    assert len(mirror.rows("school_sports_scores", school_slug="st-x")) == 2
+
+def test_changed_layout_is_rebuilt(tmp_path):
+    path = str(tmp_path / "mirror.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE school_cca_scores (school_slug, cca, year, _row, _hash,"
+        " PRIMARY KEY (school_slug, cca, year))"
+    )
+    conn.close()
+    with LocalMirror(path) as m:
+        assert m.column("school_cca_scores", "code") == []
+
+def test_empty_remote_keeps_local_copy(mirror, capsys):
+    mirror.refresh(FakeClient(schools=make_schools(5)), "schools")
+    synced = mirror.synced_at("schools")
+    stats = mirror.refresh(FakeClient(schools=[]), "schools")
+    assert stats["deleted"] == 0
+    assert len(mirror.column("schools", "name")) == 5
+    assert mirror.synced_at("schools") == synced
+    assert "returned no rows" in capsys.readouterr().out
+
+# ─── READS ──────────────────────────────────────────────────────────────────────
+def test_lookups(mirror):
+    mirror.refresh(FakeClient(schools=make_schools(3)), "schools")
+    assert len(mirror.rows("schools")) == 3
+    assert mirror.rows("schools", code=3001) == [
+        {"name": "School 001", "code": 3001, "cop_ranges": {"IP": [1, 5]}}
+    ]
+    assert mirror.get("schools", name="missing") is None
+    assert sorted(mirror.column("schools", "code")) == [3000, 3001, 3002]
+    with pytest.raises(ValueError):
+        mirror.rows("schools", address="x")
+    with pytest.raises(ValueError):
+        mirror.column("schools", "address")
+
+def test_diff_compares_only_given_columns(mirror):
+    mirror.refresh(FakeClient(schools=make_schools(3)), "schools")
+    records = [
+        {"name": "School 000", "code": "3000"},                     # same, code as str
+        {"name": "School 001", "cop_ranges": {"IP": [1, 5]}},       # same, subset
+        {"name": "School 002", "code": 1},                          # changed
+        {"name": "School 999", "code": 4000},                       # new
+    ]
+    changed, removed = mirror.diff("schools", records)
+    assert [r["name"] for r in changed] == ["School 002", "School 999"]
+    assert removed == []
+    _, removed = mirror.diff("schools", records[:1])
+    assert sorted(removed) == [("School 001",), ("School 002",)]
+
+def test_diff_only_coerces_against_stored_numbers(mirror):
+    rows = [{"name": "A", "code": "1.0", "cop_ranges": [4]}]
+    mirror.refresh(FakeClient(schools=rows), "schools")
+    changed, _ = mirror.diff("schools", [{"name": "A", "code": "1"}])
+    assert len(changed) == 1
+    changed, _ = mirror.diff("schools", [{"name": "A", "cop_ranges": [4.0]}])
+    assert changed == []
+    changed, _ = mirror.diff("schools", [{"name": "A", "cop_ranges": ["4"]}])
+    assert changed == []
+    changed, _ = mirror.diff("schools", [{"name": "A", "cop_ranges": [4, 5]}])
+    assert len(changed) == 1
+
+# ─── CLI ────────────────────────────────────────────────────────────────────────
+def test_cli_rejects_unknown_table():
+    with pytest.raises(SystemExit) as exc:
+        main(["nope"])
+    assert "Valid tables: schools" in str(exc.value)
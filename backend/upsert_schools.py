@@ -2,6 +2,7 @@
 import os
 import json
 from supabase import create_client, Client
+from local_mirror import LocalMirror
 
 # ─── CONFIG ───────────────────────────────────────────────────────────────────
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -27,8 +28,14 @@ def main():
 
     print(f"Loaded {len(records)} records from {INPUT_PATH}")
 
+    # Only send records that differ from what's already in the table
+    with LocalMirror() as mirror:
+        mirror.ensure_fresh(supabase, [TABLE_NAME])
+        changed, _ = mirror.diff(TABLE_NAME, records)
+    print(f"{len(changed)} of {len(records)} records differ from `{TABLE_NAME}`")
+
     BATCH_SIZE = 100
-    for batch in chunked_iterable(records, BATCH_SIZE):
+    for batch in chunked_iterable(changed, BATCH_SIZE):
         try:
             res = supabase.table(TABLE_NAME).upsert(batch, on_conflict=["name"]).execute()
         except Exception as exc:
@@ -46,6 +53,10 @@ def main():
         else:
             print(f"✔  Upserted {len(batch)} records (status {status})")
 
+    # Keep the local mirror in line with what was just written
+    if changed:
+        with LocalMirror() as mirror:
+            mirror.refresh(supabase, TABLE_NAME)
     print("Done.")
 
 if __name__ == "__main__":